@@ -0,0 +1,27 @@
+"""
+Development channel layer — InMemoryChannelLayer with queue reclamation.
+
+The stock in-memory layer only deletes a channel's asyncio.Queue when a
+receive() drains it or its messages expire, so WebSocket
+connect/disconnect churn leaves empty queue objects behind and memory
+grows with total disconnects rather than current connections. This
+subclass reaps the queue as soon as the channel leaves its last group.
+
+Only used when no REDIS_HOST is configured (see settings.CHANNEL_LAYERS).
+"""
+
+from channels.layers import InMemoryChannelLayer
+
+
+class BoundedInMemoryChannelLayer(InMemoryChannelLayer):
+    """In-memory layer whose memory stays flat under connection churn."""
+
+    async def group_discard(self, group, channel):
+        await super().group_discard(group, channel)
+        # The consumer calls group_discard on disconnect — if the
+        # channel's queue is empty (checked with queue.empty(), not
+        # truthiness), nothing can ever drain it, so drop it now instead
+        # of waiting for message expiry.
+        queue = self.channels.get(channel)
+        if queue is not None and queue.empty():
+            self.channels.pop(channel, None)
@@ -33,6 +33,7 @@ INSTALLED_APPS = [
     # Third-party
     'rest_framework',
     'rest_framework_simplejwt',
+    'rest_framework_simplejwt.token_blacklist',
     'channels',
 
     # Local
@@ -44,6 +45,7 @@ INSTALLED_APPS = [
 # ---------------------------------------------------------------------------
 MIDDLEWARE = [
     'django.middleware.security.SecurityMiddleware',
+    'django.middleware.gzip.GZipMiddleware',  # Compress API/JSON responses
     'whitenoise.middleware.WhiteNoiseMiddleware',  # Serves static files via Daphne
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -81,20 +83,42 @@ WSGI_APPLICATION = 'core.wsgi.application'
 ASGI_APPLICATION = 'core.asgi.application'
 
 # ---------------------------------------------------------------------------
-# Database — SQLite for development
+# Database — SQLite for development, Postgres when DB_ENGINE=postgres
 # ---------------------------------------------------------------------------
-DATABASES = {
-    'default': {
-        'ENGINE': 'django.db.backends.sqlite3',
-        'NAME': BASE_DIR / 'db.sqlite3',
+DB_ENGINE = config('DB_ENGINE', default='sqlite')
+
+if DB_ENGINE == 'postgres':
+    DATABASES = {
+        'default': {
+            'ENGINE': 'django.db.backends.postgresql',
+            'NAME': config('DB_NAME', default='core'),
+            'USER': config('DB_USER', default='postgres'),
+            'PASSWORD': config('DB_PASSWORD', default=''),
+            'HOST': config('DB_HOST', default='127.0.0.1'),
+            'PORT': config('DB_PORT', default='5432'),
+            # Persistent connections — skip the TCP + auth handshake on
+            # every request.
+            'CONN_MAX_AGE': 60,
+        }
+    }
+else:
+    DATABASES = {
+        'default': {
+            'ENGINE': 'django.db.backends.sqlite3',
+            'NAME': BASE_DIR / 'db.sqlite3',
+            # WAL / synchronous / busy_timeout pragmas are applied per
+            # connection by the connection_created receiver in
+            # users/signals.py, so readers never block the chat writer.
+        }
     }
-}
 
 # ---------------------------------------------------------------------------
 # Password validation
 # ---------------------------------------------------------------------------
 AUTH_PASSWORD_VALIDATORS = [
-    {'NAME': 'django.contrib.auth.password_validation.UserAttributeSimilarityValidator'},
+    # Substring check instead of Django's O(n²) SequenceMatcher-based
+    # similarity validator — see users/validators.py.
+    {'NAME': 'users.validators.UserAttributeSubstringValidator'},
     {'NAME': 'django.contrib.auth.password_validation.MinimumLengthValidator'},
     {'NAME': 'django.contrib.auth.password_validation.CommonPasswordValidator'},
     {'NAME': 'django.contrib.auth.password_validation.NumericPasswordValidator'},
@@ -117,8 +141,12 @@ STATICFILES_DIRS = [BASE_DIR / 'users' / 'static']
 # STATIC_ROOT: where collectstatic copies everything (served by WhiteNoise)
 STATIC_ROOT = BASE_DIR / 'staticfiles'
 
-# WhiteNoise: compress & cache static files efficiently
+# WhiteNoise: compress & cache static files efficiently.
+# With the brotli extra installed, collectstatic also writes .br siblings
+# alongside .gz, which compress noticeably better for CSS/JS payloads.
 STATICFILES_STORAGE = 'whitenoise.storage.CompressedManifestStaticFilesStorage'
+# Hashed manifest filenames are immutable — cache them for a year.
+WHITENOISE_MAX_AGE = 31536000
 
 MEDIA_URL = '/media/'
 MEDIA_ROOT = BASE_DIR / 'media'
@@ -140,6 +168,13 @@ REST_FRAMEWORK = {
     'DEFAULT_PERMISSION_CLASSES': (
         'rest_framework.permissions.IsAuthenticated',
     ),
+    # orjson-backed rendering — several times faster than the stdlib
+    # json encoder on the user-list responses. The browsable API stays
+    # available for development.
+    'DEFAULT_RENDERER_CLASSES': (
+        'drf_orjson_renderer.renderers.ORJSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ),
 }
 
 # ---------------------------------------------------------------------------
@@ -148,19 +183,48 @@ REST_FRAMEWORK = {
 SIMPLE_JWT = {
     'ACCESS_TOKEN_LIFETIME': timedelta(minutes=60),
     'REFRESH_TOKEN_LIFETIME': timedelta(days=7),
+    # Rotation without blacklisting left every superseded refresh token
+    # valid — the per-refresh signing cost bought no security. With the
+    # token_blacklist app installed, rotation actually retires old tokens.
     'ROTATE_REFRESH_TOKENS': True,
-    'BLACKLIST_AFTER_ROTATION': False,
+    'BLACKLIST_AFTER_ROTATION': True,
     'AUTH_HEADER_TYPES': ('Bearer',),
 }
 
 # ---------------------------------------------------------------------------
-# Django Channels — in-memory channel layer (use Redis in production)
-# ---------------------------------------------------------------------------
-CHANNEL_LAYERS = {
-    'default': {
-        'BACKEND': 'channels.layers.InMemoryChannelLayer',
-    },
-}
+# Django Channels
+# Redis-backed channel layer so the 'chat_room' group is shared across
+# worker processes. The in-memory layer keeps all group state inside a
+# single process (and leaks channel entries under connect/disconnect
+# churn), so it is only used when no Redis host is configured.
+# ---------------------------------------------------------------------------
+REDIS_HOST = config('REDIS_HOST', default='')
+REDIS_PORT = config('REDIS_PORT', default=6379, cast=int)
+
+if REDIS_HOST:
+    # Note: channels-redis >= 4 already fans group_send out with a single
+    # Lua script per Redis shard (one EVAL covering every channel key in
+    # the group), so broadcasts don't pay one round-trip per recipient
+    # and no custom backend is needed for that.
+    CHANNEL_LAYERS = {
+        'default': {
+            'BACKEND': 'channels_redis.core.RedisChannelLayer',
+            'CONFIG': {
+                'hosts': [(REDIS_HOST, REDIS_PORT)],
+                'capacity': 1500,
+                'expiry': 10,
+            },
+        },
+    }
+else:
+    # Local development fallback — single-process only. The subclass
+    # reclaims per-channel queues on disconnect so long dev sessions
+    # don't leak memory under connection churn.
+    CHANNEL_LAYERS = {
+        'default': {
+            'BACKEND': 'core.channels_layer.BoundedInMemoryChannelLayer',
+        },
+    }
 
 # ---------------------------------------------------------------------------
 # Email configuration (values loaded from .env)
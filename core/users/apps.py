@@ -14,3 +14,16 @@ class UsersConfig(AppConfig):
     def ready(self):
         # Import signals module so the @receiver decorators are registered
         import users.signals  # noqa: F401
+
+        # Instantiate the configured password validators now so
+        # CommonPasswordValidator's ~20k-entry gzipped wordlist is loaded
+        # at startup instead of on the first registration request.
+        from django.contrib.auth.password_validation import (
+            get_default_password_validators,
+        )
+        get_default_password_validators()
+
+        # Warm the (optionally Numba-jitted) Haversine kernel so the
+        # first nearby-users request doesn't pay the compile cost.
+        from .views import haversine
+        haversine(0.0, 0.0, 0.0, 0.0)
@@ -0,0 +1,121 @@
+"""
+users/geo.py
+
+Optional Redis geo index mirroring verified users' coordinates.
+
+When REDIS_HOST is configured, profile updates and OTP verification
+mirror coordinates into a Redis geo set (GEOADD) and NearbyUsersView
+answers radius queries with GEOSEARCH — O(log N + k) over Redis's
+geohash index, with no distance math on the app server. When the key
+is missing (first deploy, Redis restart without persistence, FLUSHDB),
+nearby_ids() rebuilds it from the database before answering, so
+pre-existing users are never silently absent. Everything here is
+best-effort: every helper degrades to "Redis can't answer" and callers
+fall back to the DB path.
+"""
+
+import logging
+
+import redis
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+GEO_KEY = 'users:geo'
+
+_client = None
+
+
+def _get_client():
+    """Lazily build the shared Redis client, or None if not configured."""
+    global _client
+    if not settings.REDIS_HOST:
+        return None
+    if _client is None:
+        _client = redis.Redis(
+            host=settings.REDIS_HOST,
+            port=settings.REDIS_PORT,
+            socket_timeout=0.25,
+        )
+    return _client
+
+
+def update_position(user_id, latitude, longitude):
+    """Mirror a user's coordinates into the geo set (best-effort)."""
+    client = _get_client()
+    if client is None:
+        return
+    try:
+        if latitude is None or longitude is None:
+            client.zrem(GEO_KEY, user_id)
+        else:
+            client.geoadd(GEO_KEY, (longitude, latitude, user_id))
+    except redis.RedisError as exc:
+        logger.warning("Redis geo update failed for user %s: %s", user_id, exc)
+
+
+def rebuild(client=None):
+    """
+    Repopulate the geo set from the database: every verified user with
+    coordinates, written in one pipelined DELETE + GEOADD. Returns True
+    on success. Called lazily by nearby_ids() when the key is missing;
+    also safe to run from a shell after restoring Redis.
+    """
+    if client is None:
+        client = _get_client()
+    if client is None:
+        return False
+
+    # Imported here: geo is pulled in at app import time, before the
+    # model registry is ready.
+    from django.contrib.auth import get_user_model
+
+    rows = (
+        get_user_model().objects.verified()
+        .exclude(latitude__isnull=True)
+        .exclude(longitude__isnull=True)
+        .values_list('id', 'latitude', 'longitude')
+    )
+    # GEOADD takes a flat (lon, lat, member, ...) sequence.
+    values = [item for uid, lat, lon in rows for item in (lon, lat, uid)]
+    try:
+        pipe = client.pipeline(transaction=True)
+        pipe.delete(GEO_KEY)
+        if values:
+            pipe.geoadd(GEO_KEY, values)
+        pipe.execute()
+    except redis.RedisError as exc:
+        logger.warning("Redis geo rebuild failed: %s", exc)
+        return False
+    return True
+
+
+def nearby_ids(latitude, longitude, radius_km):
+    """
+    Return user ids within radius_km of the point, nearest first,
+    or None when Redis is unconfigured/unreachable (caller falls back
+    to the database).
+    """
+    client = _get_client()
+    if client is None:
+        return None
+    try:
+        # A missing key means the index was never populated (or Redis
+        # lost it) — GEOSEARCH would return [] and hide every user that
+        # predates the mirroring writes. Rebuild from the DB first; if
+        # that fails, let the caller take the DB path.
+        if not client.exists(GEO_KEY):
+            if not rebuild(client):
+                return None
+        members = client.geosearch(
+            GEO_KEY,
+            longitude=longitude,
+            latitude=latitude,
+            radius=radius_km,
+            unit='km',
+            sort='ASC',
+        )
+    except redis.RedisError as exc:
+        logger.warning("Redis geo search failed: %s", exc)
+        return None
+    return [int(member) for member in members]
@@ -0,0 +1,17 @@
+# Generated by Django 4.2.30 on 2026-08-28 17:10
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0002_alter_user_managers_and_more'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='otp',
+            index=models.Index(fields=['user', '-created_at'], name='users_otp_user_id_a861c1_idx'),
+        ),
+    ]
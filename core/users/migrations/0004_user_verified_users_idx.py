@@ -0,0 +1,17 @@
+# Generated by Django 4.2.30 on 2026-08-28 17:14
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0003_otp_users_otp_user_id_a861c1_idx'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='user',
+            index=models.Index(condition=models.Q(('is_verified', True)), fields=['id'], name='verified_users_idx'),
+        ),
+    ]
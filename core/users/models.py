@@ -7,9 +7,10 @@ Defines:
   - Message: chat message for the real-time chat system
 """
 
-import random
+import secrets
 from django.db import models
 from django.contrib.auth.models import AbstractUser
+from django.contrib.auth.models import UserManager as DjangoUserManager
 from django.utils import timezone
 from datetime import timedelta
 
@@ -17,6 +18,14 @@ from datetime import timedelta
 # ---------------------------------------------------------------------------
 # Custom User Model
 # ---------------------------------------------------------------------------
+class UserManager(DjangoUserManager):
+    """Adds a shortcut for the hot is_verified=True filter."""
+
+    def verified(self):
+        """Return users who completed OTP verification."""
+        return self.filter(is_verified=True)
+
+
 class User(AbstractUser):
     """
     Extends Django's AbstractUser.
@@ -44,6 +53,23 @@ class User(AbstractUser):
     # username is still required by AbstractUser; keep it in REQUIRED_FIELDS
     REQUIRED_FIELDS = ['username']
 
+    objects = UserManager()
+
+    class Meta(AbstractUser.Meta):
+        indexes = [
+            # Covers the verified-users listing and the nearby-users
+            # coordinate range scan.
+            models.Index(fields=['is_verified', 'latitude', 'longitude']),
+            # Partial index over just the verified rows: the common
+            # is_verified=True filter scans only matching entries, and
+            # the verification UPDATE maintains it in O(1).
+            models.Index(
+                fields=['id'],
+                name='verified_users_idx',
+                condition=models.Q(is_verified=True),
+            ),
+        ]
+
     def __str__(self):
         return self.email
 
@@ -62,6 +88,16 @@ class OTP(models.Model):
     code = models.CharField(max_length=6)
     created_at = models.DateTimeField(auto_now_add=True)
 
+    class Meta:
+        indexes = [
+            # VerifyOTPView looks OTPs up by (user, code).
+            models.Index(fields=['user', 'code']),
+            # …and takes the newest per user; descending created_at makes
+            # that a single index-ordered row fetch.
+            models.Index(fields=['user', '-created_at']),
+            models.Index(fields=['created_at']),
+        ]
+
     def is_expired(self):
         """Return True if the OTP was created more than 5 minutes ago."""
         expiry_time = self.created_at + timedelta(minutes=5)
@@ -69,8 +105,10 @@ class OTP(models.Model):
 
     @staticmethod
     def generate_code():
-        """Generate a random 6-digit numeric OTP."""
-        return str(random.randint(100000, 999999))
+        """Generate a cryptographically random 6-digit numeric OTP."""
+        # One CSPRNG draw; the offset keeps a constant six-digit width,
+        # so no zero-padding format step is needed.
+        return str(secrets.randbelow(900000) + 100000)
 
     def __str__(self):
         return f"OTP({self.user.email}, {self.code})"
@@ -93,6 +131,11 @@ class Message(models.Model):
 
     class Meta:
         ordering = ['timestamp']
+        indexes = [
+            # The chat page always orders by timestamp.
+            models.Index(fields=['timestamp']),
+            models.Index(fields=['sender', 'timestamp']),
+        ]
 
     def __str__(self):
         return f"{self.sender.email}: {self.content[:40]}"
@@ -9,8 +9,8 @@ Serializers for:
   - UserSerializer              — general read-only representation
 """
 
-import math
-from django.contrib.auth import get_user_model
+from django.contrib.auth import get_user_model, password_validation
+from django.core.exceptions import ValidationError as DjangoValidationError
 from rest_framework import serializers
 from rest_framework_simplejwt.serializers import TokenObtainPairSerializer
 
@@ -39,6 +39,21 @@ class UserRegistrationSerializer(serializers.ModelSerializer):
             raise serializers.ValidationError("A user with this email already exists.")
         return value
 
+    def validate(self, attrs):
+        # Run AUTH_PASSWORD_VALIDATORS (substring, common-password,
+        # numeric checks) against the not-yet-saved user — DRF field
+        # validation alone never invokes them, so without this the
+        # configured validators only guarded the admin/management paths.
+        user = User(
+            email=attrs.get('email', ''),
+            name=attrs.get('name', ''),
+        )
+        try:
+            password_validation.validate_password(attrs['password'], user)
+        except DjangoValidationError as exc:
+            raise serializers.ValidationError({'password': exc.messages})
+        return attrs
+
     def create(self, validated_data):
         # Use create_user so the password is properly hashed
         password = validated_data.pop('password')
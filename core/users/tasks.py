@@ -0,0 +1,53 @@
+"""
+users/tasks.py
+
+Background work dispatched off the request thread. The project runs
+without a task-queue broker, so a small process-local thread pool fills
+that role; functions keep a task-style signature (ids, not instances)
+so they can move to Celery/RQ unchanged if a broker is ever added.
+"""
+
+import logging
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.mail import send_mail
+
+logger = logging.getLogger(__name__)
+
+# SMTP latency dominates these tasks; two workers keep a burst of
+# registrations from queueing behind one connection.
+_EXECUTOR = ThreadPoolExecutor(max_workers=2, thread_name_prefix='users-tasks')
+
+
+def enqueue(func, *args):
+    """Run func(*args) on the background pool."""
+    _EXECUTOR.submit(func, *args)
+
+
+def send_otp_email(user_id, code):
+    """Email a registration OTP to the user. Runs on the pool."""
+    User = get_user_model()
+    try:
+        user = User.objects.only('email', 'name').get(pk=user_id)
+    except User.DoesNotExist:
+        return
+
+    try:
+        send_mail(
+            subject='Your OTP Verification Code',
+            message=(
+                f'Hello {user.name or user.email},\n\n'
+                f'Your OTP code is: {code}\n'
+                f'This code is valid for 5 minutes.\n\n'
+                f'If you did not request this, please ignore this email.'
+            ),
+            from_email=settings.DEFAULT_FROM_EMAIL,
+            recipient_list=[user.email],
+            fail_silently=False,
+        )
+    except Exception as exc:
+        # Log the error but don't surface it — registration already
+        # succeeded by the time this runs.
+        logger.error("Failed to send OTP email to %s: %s", user.email, exc)
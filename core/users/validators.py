@@ -0,0 +1,40 @@
+"""
+users/validators.py
+
+Lightweight password validator for the sign-up hot path.
+"""
+
+from django.core.exceptions import ValidationError
+
+
+class UserAttributeSubstringValidator:
+    """
+    Rejects passwords that contain the user's email local part or name.
+
+    Cheaper stand-in for Django's UserAttributeSimilarityValidator,
+    whose difflib.SequenceMatcher comparison is O(n²) per attribute on
+    every registration. A case-insensitive substring check catches the
+    common "password contains my email/name" case at a fraction of the
+    cost.
+    """
+
+    # Very short fragments (e.g. a two-letter name) would reject almost
+    # any password, so ignore them.
+    MIN_LENGTH = 3
+
+    def validate(self, password, user=None):
+        if user is None:
+            return
+        lowered = password.lower()
+        email = getattr(user, 'email', '') or ''
+        fragments = [email.split('@')[0], getattr(user, 'name', '') or '']
+        for fragment in fragments:
+            fragment = fragment.lower()
+            if len(fragment) >= self.MIN_LENGTH and fragment in lowered:
+                raise ValidationError(
+                    "The password is too similar to your email or name.",
+                    code='password_too_similar',
+                )
+
+    def get_help_text(self):
+        return "Your password can't contain your email address or name."